@@ -3,7 +3,7 @@
 # /// script
 # requires-python = ">=3.12,<3.13"
 # dependencies = [
-#     "pictex>=1.1.1",
+#     "pillow>=11.0.0",
 #     "pyfiglet>=0.8.0",
 #     "python-decouple>=3.8",
 # ]
@@ -13,70 +13,268 @@
 
 # pyright: reportMissingImports=false
 
+import contextlib
+import functools
+import hashlib
 import os
-import pyfiglet
+import random
 import sys
 import tempfile
-from decouple import config
-from pydoc import pager
+from pathlib import Path
 from textwrap import dedent
+from types import SimpleNamespace
+
+# Help sections that do not depend on the script name, built once at import
+_COMMANDS_TEXT = (
+    f"Commands:\n"
+    f"\t{'preview <font> <text>':<39} Preview figlet text with specified font and text\n"
+    f"\t{'generate <font> <text> <file>':<39} Generate and save figlet text as PNG image\n"
+    f"\t{'batch <font> <file>':<39} Generate PNG images from text<TAB>file.png lines\n"
+    f"\t{'list':<39} List available fonts"
+)
+
+_ENV_VARS_TEXT = (
+    f"Environment Variables:\n"
+    f"\t{'FIGLET_FONT':<39} Default font (default: larry3d)\n"
+    f"\t{'FIGLET_TEXT':<39} Default text (default: Hello, World!)\n"
+    f"\t{'FONT_COLOR':<39} Font color (default: black)\n"
+    f"\t{'PNG_COMPRESS_LEVEL':<39} PNG zlib compression level 0-9 (default: 1)"
+)
+
+_NOTE_TEXT = dedent(
+    """
+    Note:
+    Generates figlet ASCII art as text preview or PNG images with transparent
+    background using Pillow, cropped to the size of the art.
+    """
+).strip().replace("\n", "\n\t")
+
+
+@functools.lru_cache(maxsize=1)
+def _defaults():
+    """Resolve environment/settings defaults once per process"""
+    from decouple import config
+
+    return SimpleNamespace(
+        font=config("FIGLET_FONT", default="larry3d"),
+        text=config("FIGLET_TEXT", default="Hello, World!"),
+        color=config("FONT_COLOR", default="black"),
+        compress_level=config("PNG_COMPRESS_LEVEL", default=1, cast=int),
+    )
+
+
+def _cache_dir():
+    """Return the on-disk cache directory, honoring XDG_CACHE_HOME"""
+    return Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "fig"
+
+
+@functools.lru_cache(maxsize=32)
+def _font_path(font, cwd=None):
+    """Resolve a font name to the file pyfiglet would load, or None, without enumerating every font
+
+    Follows FigletFont.preloadFont: .tlf before .flf, a packaged font wins outright, otherwise
+    cwd then SHARED_DIRECTORY. cwd is None to skip local fonts, matching FigletFont.getFonts().
+    """
+    import importlib.resources
+    import pyfiglet
+
+    packaged = importlib.resources.files("pyfiglet.fonts")
+    locations = (cwd, pyfiglet.SHARED_DIRECTORY) if cwd is not None else (pyfiglet.SHARED_DIRECTORY,)
+    font_path = None
+    for extension in ("tlf", "flf"):
+        filename = f"{font}.{extension}"
+        if packaged.joinpath(filename).is_file():
+            return packaged.joinpath(filename)
+        for location in locations:
+            path = Path(location, filename)
+            if path.is_file():
+                font_path = path
+                break
+    return font_path
+
+
+@functools.lru_cache(maxsize=32)
+def _get_figlet(font):
+    """Return a Figlet instance for the given font, reusing previously parsed fonts"""
+    import pyfiglet
+
+    return pyfiglet.Figlet(font=font)
+
+
+def _write_cache(path, text):
+    """Atomically write a cache entry through a temporary file, returning whether it was written"""
+    tmp_name = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=path.parent, delete=False) as f:
+            tmp_name = f.name
+            f.write(text)
+        os.replace(tmp_name, path)
+    except OSError:
+        if tmp_name:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_name)
+        return False
+    return True
+
+
+def _prune_ascii_cache(root, max_bytes):
+    """Delete the least recently used cached renders under root until the total fits in max_bytes"""
+    entries = []
+    for path in root.glob("*/*"):
+        with contextlib.suppress(OSError):
+            stat = path.stat()
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+        if total <= max_bytes:
+            break
+        with contextlib.suppress(OSError):
+            path.unlink()
+            total -= size
+
+
+@functools.lru_cache(maxsize=128)
+def _render(font, text):
+    """Render text with the given font, reusing results in memory and on disk across runs
+
+    Renders are stored under the cache directory keyed by the pyfiglet version, the identity
+    (path, mtime and size) of the font file pyfiglet resolves, and the text, so edited or
+    shadowing custom fonts are never served stale art. Writes go through a temporary file
+    so concurrent batch workers never see partial entries, and roughly one write in 256
+    prunes the cache back under 10 MB.
+    """
+    import pyfiglet
+
+    font_file = _font_path(font, os.getcwd())
+    try:
+        stat = os.stat(font_file)
+    except (OSError, TypeError):
+        # Unknown fonts raise from pyfiglet; fonts not on the filesystem skip the disk cache
+        return _get_figlet(font).renderText(text)
+
+    identity = f"{os.path.abspath(font_file)}\0{stat.st_mtime_ns}\0{stat.st_size}"
+    key = hashlib.sha1(f"{pyfiglet.__version__}\0{identity}\0{text}".encode()).hexdigest()
+    root = _cache_dir() / "ascii"
+    path = root / key[:2] / key[2:]
+
+    with contextlib.suppress(OSError, UnicodeDecodeError):
+        result = path.read_text(encoding="utf-8")
+        # Touch hits so pruning by mtime evicts the least recently used renders
+        with contextlib.suppress(OSError):
+            os.utime(path)
+        return result
+
+    result = _get_figlet(font).renderText(text)
+    if _write_cache(path, result) and random.random() < 1 / 256:
+        _prune_ascii_cache(root, 10 * 1024 * 1024)
+
+    return result
+
+
+# Monospace fonts to try in order; Courier New first, then common platform equivalents
+_MONO_FONTS = ("Courier New", "cour.ttf", "DejaVuSansMono.ttf", "LiberationMono-Regular.ttf", "Menlo.ttc")
+
+
+@functools.lru_cache(maxsize=1)
+def _mono_font():
+    """Load the 12px monospace font used for PNG output once per process"""
+    from PIL import ImageFont
+
+    for name in _MONO_FONTS:
+        with contextlib.suppress(OSError):
+            return ImageFont.truetype(name, 12)
+    # load_default() would be proportional Aileron and skew the art; the bitmap font is fixed-width
+    return ImageFont.load_default_imagefont()
+
+
+def _draw_image(ascii_art, color):
+    """Draw ASCII art on a transparent canvas sized to its text box, then crop to the visible pixels"""
+    from PIL import Image, ImageDraw
+
+    font = _mono_font()
+
+    # Measure first so the canvas is no larger than the art and nothing is clipped
+    left, top, right, bottom = ImageDraw.Draw(Image.new("RGBA", (1, 1))).multiline_textbbox((0, 0), ascii_art, font=font)
+    image = Image.new("RGBA", (max(1, right - left), max(1, bottom - top)), (0, 0, 0, 0))
+    ImageDraw.Draw(image).multiline_text((-left, -top), ascii_art, font=font, fill=color)
+
+    bbox = image.getbbox()
+    return image.crop(bbox) if bbox else image
+
+
+def _save_image(image, filename, compress_level):
+    """Save a rendered image, encoding PNGs with fpng when available or zlib at compress_level
+
+    If the optional fpng-py package is installed its SIMD encoder is used (compress_level does
+    not apply). ASCII art is mostly transparent, so low zlib levels compress nearly as well as
+    the default while encoding much faster. Unknown extensions are saved as PNG, and formats
+    without alpha support (e.g. JPEG) get the art flattened onto a white background.
+    """
+    from PIL import Image
+
+    ext = os.path.splitext(filename)[1].lower()
+    fmt = Image.registered_extensions().get(ext, "PNG")
+    if fmt != "PNG":
+        try:
+            image.save(filename, format=fmt)
+        except OSError:
+            flat = Image.new("RGB", image.size, "white")
+            flat.paste(image, mask=image.getchannel("A"))
+            flat.save(filename, format=fmt)
+        return
+
+    try:
+        import fpng_py
+    except ImportError:
+        image.save(filename, format="PNG", compress_level=compress_level)
+        return
+
+    with open(filename, "wb") as f:
+        f.write(fpng_py.fpng_encode_image_to_memory(image.tobytes(), image.width, image.height, 4))
 
 
 def halp():
     """Programmatically generate well formatted help text for the script"""
-    script_name = os.path.basename(sys.argv[0])
-
-    usage = f"Usage:\n\t{script_name} <preview|generate|list> <args...>"
-
-    commands = [
-        ("preview <font> <text>", "Preview figlet text with specified font and text"),
-        ("generate <font> <text> <file>", "Generate and save figlet text as PNG image"),
-        ("list", "List available fonts")
-    ]
-    commands_text = "Commands:\n" + "\n".join(f"\t{cmd:<39} {desc}" for cmd, desc in commands)
-
-    examples = [
-        (script_name, "# Run help (also accepts -h, --help)"),
-        (f"{script_name} preview slant", "# Preview slant font with default text"),
-        (f"{script_name} preview slant 'Hello'", "# Preview slant font with custom text"),
-        (f"{script_name} generate slant 'Hello' out.png", "# Generate PNG image"),
-        (f"{script_name} list", "# Show available fonts"),
-    ]
-    examples_text = "Examples:\n" + "\n".join(f"\t{example:<39} {comment}" for example, comment in examples)
-
-    env_vars = [
-        ("FIGLET_FONT", "Default font (default: larry3d)"),
-        ("FIGLET_TEXT", "Default text (default: Hello, World!)"),
-        ("CANVAS_WIDTH", "Canvas width in pixels (default: 728)"),
-        ("CANVAS_HEIGHT", "Canvas height in pixels (default: 90)"),
-        ("FONT_COLOR", "Font color (default: black)")
-    ]
-    env_vars_text = "Environment Variables:\n" + "\n".join(f"\t{var:<39} {desc}" for var, desc in env_vars)
-
-    note_text = dedent(
-        """
-        Note:
-        Generates figlet ASCII art as text preview or PNG images with transparent
-        background using PicTex. Default canvas size is 728x90 (leaderboard format)
-        with smart cropping enabled.
-        """
-    ).strip()
-    note_text = "\n".join(line if line == "Note:" else f"\t{line}" for line in note_text.split("\n"))
-
-    return "\n\n".join([usage, commands_text, examples_text, env_vars_text, note_text])
+    return _help_text(os.path.basename(sys.argv[0]))
+
+
+@functools.lru_cache(maxsize=4)
+def _help_text(script_name):
+    """Build the help text for a given script name; only usage and examples depend on it"""
+    preview_example = f"{script_name} preview slant 'Hello'"
+    generate_example = f"{script_name} generate slant 'Hello' out.png"
+
+    return (
+        f"Usage:\n"
+        f"\t{script_name} <preview|generate|batch|list> <args...>\n"
+        f"\n"
+        f"{_COMMANDS_TEXT}\n"
+        f"\n"
+        f"Examples:\n"
+        f"\t{script_name:<39} # Run help (also accepts -h, --help)\n"
+        f"\t{script_name + ' preview slant':<39} # Preview slant font with default text\n"
+        f"\t{preview_example:<39} # Preview slant font with custom text\n"
+        f"\t{generate_example:<39} # Generate PNG image\n"
+        f"\t{script_name + ' batch slant banners.tsv':<39} # Generate one PNG per line\n"
+        f"\t{script_name + ' list':<39} # Show available fonts\n"
+        f"\n"
+        f"{_ENV_VARS_TEXT}\n"
+        f"\n"
+        f"{_NOTE_TEXT}"
+    )
 
 
 def preview(font=None, text=None):
     """Preview figlet text with specified font and text"""
-    default_font = config("FIGLET_FONT", default="larry3d")
-    default_text = config("FIGLET_TEXT", default="Hello, World!")
+    defaults = _defaults()
 
-    font = font or default_font
-    text = text or default_text
+    font = font or defaults.font
+    text = text or defaults.text
 
     try:
-        figlet = pyfiglet.Figlet(font=font)
-        result = figlet.renderText(text)
+        result = _render(font, text)
         print(result)
     except Exception as e:
         print(f"Error: {e.__class__.__name__}: {repr(e)}", file=sys.stderr)
@@ -85,41 +283,23 @@ def preview(font=None, text=None):
 
 def generate(font=None, text=None, filename=None):
     """Generate figlet text and save as PNG image"""
-    from pictex import Canvas, CropMode
-
-    default_font = config("FIGLET_FONT", default="larry3d")
-    default_color = config("FONT_COLOR", default="black")
-    default_text = config("FIGLET_TEXT", default="Hello, World!")
-    default_width = config("CANVAS_WIDTH", default=728, cast=int)
-    default_height = config("CANVAS_HEIGHT", default=90, cast=int)
+    defaults = _defaults()
 
     # Handle case where only filename is provided (args shift left)
-    if font and font.endswith('.png') and text is None and filename is None:
+    if font and font.lower().endswith('.png') and text is None and filename is None:
         filename = font
         font = None
 
-    font = font or default_font
-    text = text or default_text
+    font = font or defaults.font
+    text = text or defaults.text
     filename = filename or "figlet_output.png"
 
     try:
-        figlet = pyfiglet.Figlet(font=font)
-        ascii_art = figlet.renderText(text)
-
-        # Create PicTex canvas with monospace font for ASCII art
-        canvas = (
-            Canvas()
-                .font_family("Courier New")
-                .font_size(12)
-                .color(default_color)
-                .background_color("#00000000")
-                .padding(20)
-                .size(width=default_width, height=default_height)
-        )
+        ascii_art = _render(font, text)
 
         # Render ASCII art to image and save with transparent background and smart cropping
-        image = canvas.render(ascii_art, crop_mode=CropMode.SMART)
-        image.save(filename)
+        image = _draw_image(ascii_art, defaults.color)
+        _save_image(image, filename, defaults.compress_level)
 
         print(f"Generated PNG image: {filename}")
 
@@ -128,80 +308,160 @@ def generate(font=None, text=None, filename=None):
         sys.exit(1)
 
 
+def _generate_one(job):
+    """Render and save one (font, text, filename, ...) job; caches are filled per worker process"""
+    font, text, filename, color, compress_level = job
+    image = _draw_image(_render(font, text), color)
+    _save_image(image, filename, compress_level)
+    return filename
+
+
+def generate_many(font, items):
+    """Generate PNG images for (text, filename) pairs, spreading the work across CPU cores"""
+    from concurrent.futures import ProcessPoolExecutor
+
+    defaults = _defaults()
+
+    font = font or defaults.font
+    jobs = [(font, text, filename, defaults.color, defaults.compress_level) for text, filename in items]
+    workers = min(len(jobs), os.cpu_count() or 1)
+
+    try:
+        # Load the font up front so a bad name fails before any workers start
+        _get_figlet(font)
+
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                chunksize = max(1, len(jobs) // (workers * 4))
+                filenames = list(executor.map(_generate_one, jobs, chunksize=chunksize))
+        else:
+            filenames = [_generate_one(job) for job in jobs]
+
+        for filename in filenames:
+            print(f"Generated PNG image: {filename}")
+
+    except Exception as e:
+        print(f"Error: {e.__class__.__name__}: {repr(e)}", file=sys.stderr)
+        sys.exit(1)
+
+
+def batch(font, inputfile):
+    """Generate PNG images from an input file of text<TAB>file.png lines"""
+    try:
+        lines = Path(inputfile).read_text().splitlines()
+    except OSError as e:
+        print(f"Error: {e.__class__.__name__}: {repr(e)}", file=sys.stderr)
+        sys.exit(1)
+
+    items = []
+    for lineno, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        text, sep, filename = line.partition("\t")
+        if not sep:
+            print(f"Error: {inputfile}:{lineno}: expected text<TAB>file.png", file=sys.stderr)
+            sys.exit(1)
+        items.append((text, filename))
+
+    generate_many(font, items)
+
+
 def list_fonts():
     """List all available figlet fonts"""
-    fonts = pyfiglet.FigletFont.getFonts()
-    output = ["Available fonts:"]
-    output.extend([f"  {font}" for font in sorted(fonts)])
-
-    # Use pager if output is long, otherwise print directly
-    full_output = "\n".join(output)
-    if len(output) > 30:
-        pager(full_output)
+    import pyfiglet
+    import shutil
+    import subprocess
+
+    # Font set changes when pyfiglet is upgraded or fonts are installed into either font
+    # directory, so key the cache on its version and both directories' mtimes
+    stamp = [pyfiglet.__version__]
+    for directory in (Path(pyfiglet.__file__).parent / "fonts", pyfiglet.SHARED_DIRECTORY):
+        try:
+            stamp.append(f"{directory}\0{os.stat(directory).st_mtime_ns}")
+        except OSError:
+            stamp.append(f"{directory}\0-")
+    key = hashlib.sha1("\0".join(stamp).encode()).hexdigest()[:16]
+    cache_path = _cache_dir() / f"fonts-{pyfiglet.__version__}-{key}.txt"
+    try:
+        fonts = cache_path.read_text(encoding="utf-8").splitlines()
+    except (OSError, UnicodeDecodeError):
+        fonts = sorted(pyfiglet.FigletFont.getFonts())
+        _write_cache(cache_path, "\n".join(fonts))
+
+    def write(out):
+        out.write("Available fonts:\n")
+        for font in fonts:
+            out.write(f"  {font}\n")
+
+    # Stream straight into less on a terminal (-F exits if it fits one screen), otherwise print directly
+    less = shutil.which("less")
+    if less and sys.stdout.isatty():
+        pager = subprocess.Popen([less, "-R", "-F", "-X"], stdin=subprocess.PIPE, text=True)
+        with contextlib.suppress(BrokenPipeError), pager:
+            write(pager.stdin)
     else:
-        print(full_output)
+        write(sys.stdout)
+
+
+def _preview_smart(arg):
+    """Preview a single argument as a font if one exists by that name, otherwise as text"""
+    try:
+        # Test if it's a valid font
+        if _font_path(arg) is not None:
+            preview(arg, None)
+        else:
+            preview(None, arg)
+    except Exception:
+        preview(None, arg)
+
+
+def _unexpected(args):
+    """Report an argument pattern that matches neither explicit nor implicit syntax"""
+    print(f"Unexpected arguments: {args}")
+    print(halp())
+
+
+# Explicit command syntax keyed on (command, argument count)
+_DISPATCH = {
+    ("", 0): lambda args: print(halp()),
+    ("help", 1): lambda args: print(halp()),
+    ("-h", 1): lambda args: print(halp()),
+    ("--help", 1): lambda args: print(halp()),
+    ("list", 1): lambda args: list_fonts(),
+    ("preview", 1): lambda args: preview(None, None),
+    ("preview", 2): lambda args: _preview_smart(args[1]),
+    ("preview", 3): lambda args: preview(args[1], args[2]),
+    ("generate", 1): lambda args: generate(None, None, None),
+    ("generate", 2): lambda args: generate(args[1], None, None),
+    ("generate", 3): lambda args: generate(args[1], args[2], None),
+    ("generate", 4): lambda args: generate(args[1], args[2], args[3]),
+    ("batch", 3): lambda args: batch(args[1], args[2]),
+}
+
+# Implicit syntax (backwards compatibility) keyed on (argument count, last argument is a .png)
+_IMPLICIT = {
+    # fig.py file.png - use all defaults
+    (1, True): lambda args: generate(None, None, args[0]),
+    # fig.py "text" file.png - use default font
+    (2, True): lambda args: generate(None, args[0], args[1]),
+    # fig.py font "text" file.png - use specified font
+    (3, True): lambda args: generate(args[0], args[1], args[2]),
+    # fig.py font - preview with font and default text
+    (1, False): lambda args: preview(args[0], None),
+    # fig.py font "text" - preview with font and text
+    (2, False): lambda args: preview(args[0], args[1]),
+}
 
 
 def main():
     args = sys.argv[1:]
 
-    # Use pattern matching on the argument structure
-    match args:
-        # Help cases
-        case [] | ["help"] | ["-h"] | ["--help"]:
-            print(halp())
-
-        # List fonts
-        case ["list"]:
-            list_fonts()
-
-        # Explicit command syntax (matches documentation examples)
-        case ["preview"]:
-            preview(None, None)
-        case ["preview", arg]:
-            # Smart detection: try as font first, fallback to text if font not found
-            try:
-                # Test if it's a valid font
-                import pyfiglet
-                pyfiglet.FigletFont.getFonts()
-                if arg in pyfiglet.FigletFont.getFonts():
-                    preview(arg, None)
-                else:
-                    preview(None, arg)
-            except Exception:
-                preview(None, arg)
-        case ["preview", font, text]:
-            preview(font, text)
-        case ["generate"]:
-            generate(None, None, None)
-        case ["generate", font]:
-            generate(font, None, None)
-        case ["generate", font, text]:
-            generate(font, text, None)
-        case ["generate", font, text, filename]:
-            generate(font, text, filename)
-
-        # Implicit syntax (backwards compatibility)
-        case [text, filename] if filename.endswith('.png'):
-            # fig.py "text" file.png - use default font
-            generate(None, text, filename)
-        case [font, text, filename] if filename.endswith('.png'):
-            # fig.py font "text" file.png - use specified font
-            generate(font, text, filename)
-        case [filename] if filename.endswith('.png'):
-            # fig.py file.png - use all defaults
-            generate(None, None, filename)
-        case [font]:
-            # fig.py font - preview with font and default text
-            preview(font, None)
-        case [font, text]:
-            # fig.py font "text" - preview with font and text
-            preview(font, text)
-
-        # Fallback for unexpected patterns
-        case _:
-            print(f"Unexpected arguments: {args}")
-            print(halp())
+    handler = _DISPATCH.get((args[0] if args else "", len(args)))
+    if handler is None:
+        # Only the last argument can be an output file, so its suffix is the only one checked
+        last_png = bool(args) and args[-1].lower().endswith('.png')
+        handler = _IMPLICIT.get((len(args), last_png), _unexpected)
+    handler(args)
 
 
 if __name__ == "__main__":
@@ -16,6 +16,15 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 import fig
 
 
+@pytest.fixture(autouse=True)
+def reset_caches(tmp_path_factory, monkeypatch):
+    """Re-read environment defaults for every test and keep on-disk caches out of the user's home."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path_factory.mktemp("cache")))
+    fig._defaults.cache_clear()
+    yield
+    fig._defaults.cache_clear()
+
+
 class TestHelpAndList:
     """Test help display and font listing functionality."""
 
@@ -25,7 +34,7 @@ class TestHelpAndList:
             fig.main()
         captured = capsys.readouterr()
         assert "Usage:" in captured.out
-        assert "fig.py <preview|generate|list>" in captured.out
+        assert "fig.py <preview|generate|batch|list>" in captured.out
         assert "Environment Variables:" in captured.out
 
     def test_help_command(self, capsys):
@@ -44,6 +53,13 @@ class TestHelpAndList:
             captured = capsys.readouterr()
             assert "Usage:" in captured.out
 
+    def test_help_text_cached(self):
+        """halp() should return the same prebuilt string on repeat calls for a script name."""
+        with patch.object(sys, 'argv', ['/usr/local/bin/fig']):
+            first = fig.halp()
+            assert fig.halp() is first
+        assert "\tfig <preview|generate|batch|list>" in first
+
     def test_list_fonts(self, capsys):
         """main(['list']) should show available fonts."""
         with patch.object(sys, 'argv', ['fig.py', 'list']):
@@ -92,6 +108,19 @@ class TestPreviewCommand:
         captured = capsys.readouterr()
         assert len(captured.out.strip()) > 0
 
+    def test_preview_smart_detection_skips_font_scan(self, capsys):
+        """main(['preview', font]) should detect fonts without enumerating every installed font."""
+        import pyfiglet
+
+        with (
+            patch.object(sys, 'argv', ['fig.py', 'preview', 'slant']),
+            patch.object(pyfiglet.FigletFont, 'getFonts', side_effect=AssertionError("font scan")),
+        ):
+            fig.main()
+        captured = capsys.readouterr()
+        assert len(captured.out.strip()) > 0
+        assert "Error:" not in captured.err
+
     def test_preview_invalid_font_fallback(self):
         """Invalid font should fallback to treating as text."""
         # This should not raise an exception
@@ -130,6 +159,39 @@ class TestGenerateCommand:
         assert "Generated PNG image:" in captured.out
         assert output_file.exists()
 
+    def test_generate_smart_crop(self, tmp_path):
+        """Generated PNGs should be cropped to the art without clipping tall art."""
+        from PIL import Image
+
+        output_file = tmp_path / "crop.png"
+        fig.generate("larry3d", "Tall", str(output_file))
+        with Image.open(output_file) as image:
+            assert image.mode == "RGBA"
+            assert image.getbbox() == (0, 0, image.width, image.height)
+            assert image.height > 90
+
+    def test_generate_jpeg(self, tmp_path, capsys):
+        """generate() with a .jpg filename should flatten the transparent art and write a JPEG."""
+        from PIL import Image
+
+        output_file = tmp_path / "out.jpg"
+        fig.generate("slant", "Hi", str(output_file))
+        captured = capsys.readouterr()
+        assert "Generated PNG image:" in captured.out
+        with Image.open(output_file) as image:
+            assert image.format == "JPEG"
+            assert image.mode == "RGB"
+
+    def test_mono_font_fallback_is_monospace(self):
+        """Without any known monospace font installed, the fallback should still be fixed-width."""
+        fig._mono_font.cache_clear()
+        try:
+            with patch.object(fig, '_MONO_FONTS', ('nonexistent_font_12345.ttf',)):
+                font = fig._mono_font()
+            assert font.getlength("i") == font.getlength("W")
+        finally:
+            fig._mono_font.cache_clear()
+
     def test_generate_via_main(self, tmp_path, capsys):
         """main(['generate', font, text, file]) should work."""
         output_file = tmp_path / "test_main.png"
@@ -140,6 +202,46 @@ class TestGenerateCommand:
         assert output_file.exists()
 
 
+class TestBatchCommand:
+    """Test batch generation of multiple PNG images."""
+
+    def test_generate_many(self, tmp_path, capsys):
+        """generate_many() should create one PNG per (text, filename) pair."""
+        items = [("One", str(tmp_path / "one.png")), ("Two", str(tmp_path / "two.png"))]
+        fig.generate_many("standard", items)
+        captured = capsys.readouterr()
+        assert captured.out.count("Generated PNG image:") == 2
+        assert (tmp_path / "one.png").exists()
+        assert (tmp_path / "two.png").exists()
+
+    def test_generate_many_process_pool(self, tmp_path, capsys):
+        """generate_many() should fan out across worker processes when cores are available."""
+        items = [(f"Item {i}", str(tmp_path / f"item{i}.png")) for i in range(4)]
+        with patch("os.cpu_count", return_value=2):
+            fig.generate_many("standard", items)
+        captured = capsys.readouterr()
+        assert captured.out.count("Generated PNG image:") == 4
+        assert all(Path(filename).exists() for _, filename in items)
+
+    def test_batch_via_main(self, tmp_path, capsys):
+        """main(['batch', font, inputfile]) should read text<TAB>file.png lines."""
+        inputfile = tmp_path / "batch.tsv"
+        inputfile.write_text(f"Alpha\t{tmp_path / 'alpha.png'}\n\nBeta\t{tmp_path / 'beta.png'}\n")
+        with patch.object(sys, 'argv', ['fig.py', 'batch', 'slant', str(inputfile)]):
+            fig.main()
+        captured = capsys.readouterr()
+        assert captured.out.count("Generated PNG image:") == 2
+        assert (tmp_path / "alpha.png").exists()
+        assert (tmp_path / "beta.png").exists()
+
+    def test_batch_malformed_line(self, tmp_path):
+        """Lines without a tab separator should show an error."""
+        inputfile = tmp_path / "bad.tsv"
+        inputfile.write_text("no separator here\n")
+        with pytest.raises(SystemExit):
+            fig.batch("standard", str(inputfile))
+
+
 class TestImplicitSyntax:
     """Test backwards compatibility with implicit syntax."""
 
@@ -195,15 +297,6 @@ class TestEnvironmentVariables:
         captured = capsys.readouterr()
         assert len(captured.out.strip()) > 0
 
-    @patch.dict("os.environ", {"CANVAS_WIDTH": "500", "CANVAS_HEIGHT": "100"})
-    def test_canvas_dimensions_env(self, tmp_path, capsys):
-        """Canvas dimensions from env vars should be used."""
-        output_file = tmp_path / "env_dimensions.png"
-        fig.generate("standard", "Test", str(output_file))
-        captured = capsys.readouterr()
-        assert "Generated PNG image:" in captured.out
-        assert output_file.exists()
-
     @patch.dict("os.environ", {"FONT_COLOR": "red"})
     def test_font_color_env(self, tmp_path, capsys):
         """Font color from env var should be used."""
@@ -213,6 +306,39 @@ class TestEnvironmentVariables:
         assert "Generated PNG image:" in captured.out
         assert output_file.exists()
 
+    @patch.dict("os.environ", {"PNG_COMPRESS_LEVEL": "9"})
+    def test_png_compress_level_env(self, tmp_path, capsys):
+        """PNG compression level from env var should still produce a valid PNG."""
+        output_file = tmp_path / "env_compress.png"
+        fig.generate("standard", "Test", str(output_file))
+        captured = capsys.readouterr()
+        assert "Generated PNG image:" in captured.out
+        assert output_file.read_bytes().startswith(b"\x89PNG\r\n\x1a\n")
+
+    def test_png_compress_level_env_zlib(self, tmp_path, monkeypatch):
+        """Without fpng-py, PNG_COMPRESS_LEVEL should control Pillow's zlib encoder."""
+        sizes = {}
+        with patch.dict(sys.modules, {"fpng_py": None}):
+            for level in ("0", "9"):
+                monkeypatch.setenv("PNG_COMPRESS_LEVEL", level)
+                fig._defaults.cache_clear()
+                output_file = tmp_path / f"zlib_{level}.png"
+                fig.generate("standard", "Test", str(output_file))
+                assert output_file.read_bytes().startswith(b"\x89PNG\r\n\x1a\n")
+                sizes[level] = output_file.stat().st_size
+        assert sizes["0"] > sizes["9"]
+
+    def test_png_fpng_encoder(self, tmp_path):
+        """With fpng-py installed, PNGs should be encoded by fpng."""
+        fpng_py = pytest.importorskip("fpng_py")
+        output_file = tmp_path / "fpng.png"
+        with patch.object(
+            fpng_py, "fpng_encode_image_to_memory", wraps=fpng_py.fpng_encode_image_to_memory
+        ) as encode:
+            fig.generate("standard", "Test", str(output_file))
+        encode.assert_called_once()
+        assert output_file.read_bytes().startswith(b"\x89PNG\r\n\x1a\n")
+
 
 class TestErrorHandling:
     """Test error handling and edge cases."""
@@ -244,6 +370,15 @@ class TestFileOperations:
         assert "Generated PNG image:" in captured.out
         assert output_file.exists()
 
+    def test_png_extension_case_insensitive(self, tmp_path, capsys):
+        """Uppercase .PNG extensions should also trigger generation."""
+        output_file = tmp_path / "UPPER.PNG"
+        with patch.object(sys, 'argv', ['fig.py', 'Test Text', str(output_file)]):
+            fig.main()
+        captured = capsys.readouterr()
+        assert "Generated PNG image:" in captured.out
+        assert output_file.read_bytes().startswith(b"\x89PNG")
+
     def test_absolute_paths(self, tmp_path, capsys):
         """Absolute paths should work correctly."""
         output_file = tmp_path / "absolute.png"
@@ -277,5 +412,183 @@ class TestDirectFunctionCalls:
         assert output_file.exists()
 
 
+class TestCaching:
+    """Test memoization of fonts and rendered output."""
+
+    def test_figlet_instance_reused(self):
+        """_get_figlet() should return the same instance for the same font."""
+        assert fig._get_figlet("standard") is fig._get_figlet("standard")
+        assert fig._get_figlet("standard") is not fig._get_figlet("slant")
+
+    def test_font_path_resolution(self):
+        """_font_path() should resolve installed fonts directly and reject unknown names."""
+        assert fig._font_path("slant").name == "slant.flf"
+        assert fig._font_path("nonexistent_font_12345") is None
+
+    def test_font_path_local_fonts(self, tmp_path):
+        """_font_path() should only see cwd fonts when given a cwd, and packaged fonts should win."""
+        import shutil
+
+        shutil.copy(fig._font_path("standard"), tmp_path / "localfont_12345.flf")
+        shutil.copy(fig._font_path("standard"), tmp_path / "slant.tlf")
+        assert fig._font_path("localfont_12345") is None
+        assert fig._font_path("localfont_12345", str(tmp_path)) == tmp_path / "localfont_12345.flf"
+        assert fig._font_path("slant", str(tmp_path)) == fig._font_path("slant")
+
+    def test_render_cached(self):
+        """_render() should only lay out a given (font, text) pair once."""
+        fig._render.cache_clear()
+        first = fig._render("standard", "Cache")
+        second = fig._render("standard", "Cache")
+        assert first == second
+        assert fig._render.cache_info().hits == 1
+
+    @patch.dict("os.environ", {"FIGLET_FONT": "slant", "FONT_COLOR": "red"})
+    def test_defaults_resolved_once(self):
+        """_defaults() should read environment defaults once and reuse them."""
+        defaults = fig._defaults()
+        assert defaults.font == "slant"
+        assert defaults.color == "red"
+        assert fig._defaults() is defaults
+
+    def test_render_disk_cache(self, tmp_path, monkeypatch):
+        """_render() should persist renders to disk and read them back in a fresh process."""
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        fig._render.cache_clear()
+        result = fig._render("standard", "Disk")
+        cached = list((tmp_path / "fig" / "ascii").glob("*/*"))
+        assert len(cached) == 1
+        assert cached[0].read_text(encoding="utf-8") == result
+
+        # Simulate a new process: the in-memory cache is empty but the disk entry is used
+        cached[0].write_text("from disk", encoding="utf-8")
+        fig._render.cache_clear()
+        assert fig._render("standard", "Disk") == "from disk"
+        fig._render.cache_clear()
+
+    def test_render_disk_cache_tracks_font_file(self, tmp_path, monkeypatch):
+        """Editing a custom font file should invalidate its cached renders."""
+        import shutil
+
+        monkeypatch.chdir(tmp_path)
+        font_file = tmp_path / "myfont_12345.flf"
+        shutil.copy(fig._font_path("slant"), font_file)
+        fig._render.cache_clear()
+        fig._get_figlet.cache_clear()
+        slant = fig._render("myfont_12345", "Hi")
+
+        shutil.copy(fig._font_path("standard"), font_file)
+        fig._render.cache_clear()
+        fig._get_figlet.cache_clear()
+        assert fig._render("myfont_12345", "Hi") != slant
+        assert fig._render("myfont_12345", "Hi") == fig._render("standard", "Hi")
+        fig._render.cache_clear()
+        fig._get_figlet.cache_clear()
+
+    def test_render_disk_cache_corrupt_entry(self, tmp_path, monkeypatch):
+        """Undecodable cache entries should be treated as misses."""
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        fig._render.cache_clear()
+        expected = fig._render("standard", "Corrupt")
+        (entry,) = (tmp_path / "fig" / "ascii").glob("*/*")
+        entry.write_bytes(b"\xff\xfe\x80")
+        fig._render.cache_clear()
+        assert fig._render("standard", "Corrupt") == expected
+        fig._render.cache_clear()
+
+    def test_render_disk_cache_cleans_up_failed_write(self, tmp_path, monkeypatch):
+        """A failed cache write should not leave temporary files behind."""
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        fig._render.cache_clear()
+        with patch("os.replace", side_effect=OSError("disk full")):
+            assert fig._render("standard", "Leak").strip()
+        assert list((tmp_path / "fig" / "ascii").glob("*/*")) == []
+        fig._render.cache_clear()
+
+    def test_prune_ascii_cache(self, tmp_path):
+        """_prune_ascii_cache() should delete the least recently used entries until under the size limit."""
+        for i in range(3):
+            path = tmp_path / "ab" / f"entry{i}"
+            path.parent.mkdir(exist_ok=True)
+            path.write_text("x" * 100)
+            os.utime(path, (i, i))
+        fig._prune_ascii_cache(tmp_path, 250)
+        remaining = sorted(path.name for path in tmp_path.glob("*/*"))
+        assert remaining == ["entry1", "entry2"]
+
+    def test_prune_ascii_cache_keeps_recent_hits(self, tmp_path, monkeypatch):
+        """Disk cache hits should refresh an entry so pruning evicts least recently used renders."""
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        fig._render.cache_clear()
+        fig._render("standard", "Old")
+        entries = list((tmp_path / "fig" / "ascii").glob("*/*"))
+        os.utime(entries[0], (0, 0))
+        fig._render("standard", "New")
+        entries = list((tmp_path / "fig" / "ascii").glob("*/*"))
+        for entry in entries:
+            if entry.stat().st_mtime:
+                os.utime(entry, (1, 1))
+
+        fig._render.cache_clear()
+        fig._render("standard", "Old")
+        root = tmp_path / "fig" / "ascii"
+        fig._prune_ascii_cache(root, max(entry.stat().st_size for entry in entries))
+        fig._render.cache_clear()
+        assert [entry.read_text(encoding="utf-8") for entry in root.glob("*/*")] == [fig._render("standard", "Old")]
+        fig._render.cache_clear()
+
+    def test_list_fonts_disk_cache(self, tmp_path, monkeypatch, capsys):
+        """list_fonts() should persist the sorted font list under XDG_CACHE_HOME."""
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        fig.list_fonts()
+        cached = list((tmp_path / "fig").glob("fonts-*.txt"))
+        assert len(cached) == 1
+        fonts = cached[0].read_text().splitlines()
+        assert fonts == sorted(fonts)
+        assert "standard" in fonts
+
+        fig.list_fonts()
+        captured = capsys.readouterr()
+        assert captured.out.count("Available fonts:") == 2
+
+    def test_list_fonts_sees_shared_directory_installs(self, tmp_path, monkeypatch, capsys):
+        """Fonts installed into pyfiglet.SHARED_DIRECTORY should show up despite the disk cache."""
+        import pyfiglet
+        import shutil
+
+        shared = tmp_path / "shared"
+        shared.mkdir()
+        monkeypatch.setattr(pyfiglet, "SHARED_DIRECTORY", str(shared))
+        fig.list_fonts()
+        assert "zzcustom" not in capsys.readouterr().out
+
+        shutil.copy(fig._font_path("standard"), shared / "zzcustom.flf")
+        os.utime(shared, ns=(0, os.stat(shared).st_mtime_ns + 1_000_000_000))
+        fig.list_fonts()
+        assert "  zzcustom\n" in capsys.readouterr().out
+
+    def test_list_fonts_unreadable_cache(self, tmp_path, monkeypatch, capsys):
+        """An unreadable font list cache should be treated as a miss and rebuilt from pyfiglet."""
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        fig.list_fonts()
+        (cached,) = (tmp_path / "fig").glob("fonts-*.txt")
+        cached.unlink()
+        cached.mkdir()
+        capsys.readouterr()
+
+        fig.list_fonts()
+        captured = capsys.readouterr()
+        assert "  standard\n" in captured.out
+        assert "  slant\n" in captured.out
+
+    def test_list_fonts_failed_cache_write(self, tmp_path, monkeypatch, capsys):
+        """A failed font list cache write should leave neither a partial list nor temp files."""
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        with patch("os.replace", side_effect=OSError("disk full")):
+            fig.list_fonts()
+        assert "  standard\n" in capsys.readouterr().out
+        assert list((tmp_path / "fig").iterdir()) == []
+
+
 if __name__ == "__main__":
     pytest.main([__file__])